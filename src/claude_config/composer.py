@@ -6,11 +6,14 @@ using Jinja2 templates to generate complete agent markdown files and
 data-driven global CLAUDE.md coordination guides.
 """
 
+import copy
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 import yaml
 import logging
-import re
 import json
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import BaseModel, Field
@@ -19,6 +22,33 @@ from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader; it parses the same safe subset much faster
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Markers bounding the "## Description" section body in trait markdown
+_DESCRIPTION_HEADING = "## Description\n\n"
+_NEXT_HEADING = "\n## "
+
+
+@functools.lru_cache(maxsize=512)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file, memoized on its path, modification time and size.
+
+    The parsed data is shared between cache hits; go through ``_load_yaml``,
+    which hands each caller its own copy.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _load_yaml(path: Path) -> Any:
+    """Load a YAML file, re-parsing only when it changed on disk.
+
+    Returns a deep copy of the cached data so callers may mutate it freely.
+    """
+    stat = path.stat()
+    return copy.deepcopy(_load_yaml_cached(str(path), stat.st_mtime_ns, stat.st_size))
+
 
 class TechnologyFramework(BaseModel):
     """Configuration for a technology framework."""
@@ -188,7 +218,7 @@ class TraitProcessor:
                 if len(parts) >= 3:
                     frontmatter = parts[1].strip()
                     if frontmatter:
-                        metadata = yaml.safe_load(frontmatter)
+                        metadata = yaml.load(frontmatter, Loader=SafeLoader)
                     content = parts[2].strip()
             except yaml.YAMLError:
                 # If frontmatter parsing fails, treat as regular markdown
@@ -212,10 +242,13 @@ class TraitProcessor:
 
     def _extract_description_from_content(self, content: str) -> str:
         """Extract description from content if no frontmatter description."""
-        # Look for ## Description section
-        desc_match = re.search(r'## Description\n\n(.+?)(?:\n## |\Z)', content, re.DOTALL)
-        if desc_match:
-            return desc_match.group(1).strip()
+        # Look for ## Description section; fixed markers need no regex engine
+        start = content.find(_DESCRIPTION_HEADING)
+        if start != -1:
+            start += len(_DESCRIPTION_HEADING)
+            if start < len(content):
+                end = content.find(_NEXT_HEADING, start + 1)
+                return content[start:end if end != -1 else None].strip()
 
         # Fallback to first paragraph
         lines = content.split('\n')
@@ -294,13 +327,16 @@ class AgentComposer:
 
         # Initialize MCP processor
 
-        # Initialize Jinja2 environment
+        # Initialize Jinja2 environment; templates don't change during a build,
+        # so skip the per-lookup staleness check
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False
         )
+        self._agent_template = None
     
     
     def load_agent(self, agent_name: str) -> AgentConfig:
@@ -309,8 +345,7 @@ class AgentComposer:
         if not agent_path.exists():
             raise FileNotFoundError(f"Agent not found: {agent_path}")
         
-        with open(agent_path, 'r') as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(agent_path)
         
         return AgentConfig(**data)
 
@@ -322,11 +357,10 @@ class AgentComposer:
         if not trait_path.exists():
             raise FileNotFoundError(f"Trait not found: {trait_path}")
         
-        with open(trait_path, 'r') as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(trait_path)
         
         return TraitConfig(**data)
-    
+
     def load_content(self, content_path: str) -> str:
         """Load markdown content from the content directory."""
         full_path = self.data_dir / "content" / content_path
@@ -355,8 +389,10 @@ class AgentComposer:
                 logger.error(f"Failed to process trait imports for {agent_config.name}: {e}")
                 # Continue with empty imported traits rather than failing
 
-        # Get the agent template
-        template = self.jinja_env.get_template('agent.md.j2')
+        # Get the agent template, compiled once per composer
+        if self._agent_template is None:
+            self._agent_template = self.jinja_env.get_template('agent.md.j2')
+        template = self._agent_template
 
         # Render the agent with enhanced context
         render_context = {
@@ -385,33 +421,56 @@ class AgentComposer:
         
         # Write agent file
         output_path = agents_dir / f"{output_name}.md"
-        with open(output_path, 'w') as f:
-            f.write(agent_content)
+        output_path.write_bytes(agent_content.encode('utf-8'))
         
         logger.info(f"Agent {agent_name} built successfully: {output_path}")
         return output_path
     
     
-    def build_all_agents(self) -> List[Path]:
-        """Build all agents found in the personas directory."""
+    def _buildable_agent_names(self) -> List[str]:
+        """Return the names of all agents in the personas directory, alphabetically."""
         personas_dir = self.data_dir / "personas"
         if not personas_dir.exists():
             return []
-        
+
+        persona_files = sorted(personas_dir.glob("*.yaml"), key=lambda p: p.stem)
+        return [p.stem for p in persona_files if p.stem not in ["config"]]
+
+    def _try_build_agent(self, agent_name: str) -> Optional[Path]:
+        """Build an agent, reporting failures instead of raising."""
+        try:
+            return self.build_agent(agent_name)
+        except Exception as e:
+            print(f"Error building {agent_name}: {e}")
+            return None
+
+    def build_all_agents(self) -> List[Path]:
+        """Build all agents found in the personas directory."""
         built_agents = []
-        
+
         # Process all agent files in alphabetical order
-        persona_files = sorted(personas_dir.glob("*.yaml"), key=lambda p: p.stem)
-        for persona_file in persona_files:
-            if persona_file.stem not in ["config"]:
-                agent_name = persona_file.stem
-                try:
-                    agent_path = self.build_agent(agent_name)
-                    built_agents.append(agent_path)
-                except Exception as e:
-                    print(f"Error building {agent_name}: {e}")
-        
+        for agent_name in self._buildable_agent_names():
+            agent_path = self._try_build_agent(agent_name)
+            if agent_path is not None:
+                built_agents.append(agent_path)
+
         return built_agents
+
+    def build_all_agents_parallel(self, max_workers: Optional[int] = None) -> List[Path]:
+        """Build all agents concurrently on a thread pool.
+
+        Builds the same agents as build_all_agents and returns them in the
+        same alphabetical order; each agent's YAML load, render and write
+        are independent, so they overlap on file I/O.
+        """
+        agent_names = self._buildable_agent_names()
+        if not agent_names:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            results = list(executor.map(self._try_build_agent, agent_names))
+
+        return [path for path in results if path is not None]
     
     def load_all_agents(self) -> List[AgentConfig]:
         """Load all agent configurations from the personas directory."""
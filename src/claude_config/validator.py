@@ -11,7 +11,7 @@ from typing import List, Optional, Dict, Any
 import yaml
 from pydantic import BaseModel, ValidationError
 
-from .composer import TraitConfig, AgentConfig
+from .composer import SafeLoader, TraitConfig, AgentConfig
 
 
 class ValidationResult(BaseModel):
@@ -243,7 +243,7 @@ class ConfigValidator:
         
         try:
             with open(file_path, 'r') as f:
-                yaml.safe_load(f)
+                yaml.load(f, Loader=SafeLoader)
             return ValidationResult(is_valid=True)
         except yaml.YAMLError as e:
             return ValidationResult(is_valid=False, errors=[f"Invalid YAML: {e}"])
@@ -259,7 +259,7 @@ class ConfigValidator:
 
         try:
             with open(agent_path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
 
             # Try to create AgentConfig - this validates required fields
             AgentConfig(**data)
@@ -301,7 +301,7 @@ class ConfigValidator:
 
         try:
             with open(trait_path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
             TraitConfig(**data)
             return ValidationResult(is_valid=True)
         except ValidationError as e:
@@ -313,33 +313,41 @@ class ConfigValidator:
         print("Validating configurations...")
         overall_valid = True
 
-        # Validate agents in alphabetical order
+        # Collect agents in alphabetical order
         personas_dir = self.data_dir / "personas"
+        agent_names = []
         if personas_dir.exists():
-            persona_files = sorted(personas_dir.glob("*.yaml"), key=lambda p: p.stem)
-            for persona_file in persona_files:
-                if persona_file.stem != "config":
-                    result = self.validate_agent(persona_file.stem)
-                    if result.is_valid:
-                        print(f"✅ {persona_file.stem}")
-                        if result.warnings:
-                            for warning in result.warnings:
-                                print(f"   ⚠️  {warning}")
-                    else:
-                        print(f"❌ {persona_file.stem}: {', '.join(result.errors)}")
-                        overall_valid = False
+            agent_names = sorted(
+                persona_file.stem for persona_file in personas_dir.glob("*.yaml")
+                if persona_file.stem != "config"
+            )
 
-        # Validate traits in alphabetical order
+        # Collect traits in alphabetical order
         traits_dir = self.data_dir / "traits"
+        trait_names = []
         if traits_dir.exists():
-            trait_files = sorted(traits_dir.rglob("*.yaml"), key=lambda p: str(p.relative_to(traits_dir).with_suffix('')))
-            for trait_file in trait_files:
-                trait_name = str(trait_file.relative_to(traits_dir).with_suffix(''))
-                result = self.validate_trait(trait_name)
-                if result.is_valid:
-                    print(f"✅ trait: {trait_name}")
-                else:
-                    print(f"❌ trait: {trait_name}: {', '.join(result.errors)}")
-                    overall_valid = False
+            trait_names = sorted(
+                str(trait_file.relative_to(traits_dir).with_suffix(''))
+                for trait_file in traits_dir.rglob("*.yaml")
+            )
+
+        for agent_name in agent_names:
+            result = self.validate_agent(agent_name)
+            if result.is_valid:
+                print(f"✅ {agent_name}")
+                if result.warnings:
+                    for warning in result.warnings:
+                        print(f"   ⚠️  {warning}")
+            else:
+                print(f"❌ {agent_name}: {', '.join(result.errors)}")
+                overall_valid = False
+
+        for trait_name in trait_names:
+            result = self.validate_trait(trait_name)
+            if result.is_valid:
+                print(f"✅ trait: {trait_name}")
+            else:
+                print(f"❌ trait: {trait_name}: {', '.join(result.errors)}")
+                overall_valid = False
 
         return overall_valid
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Shared persona scan for the validation frameworks.
+
+Parses every persona once and records the cross-agent data that both the
+enhanced validation and cross-agent integration frameworks derive from.
+"""
+
+import functools
+import sys
+import yaml
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Top-level persona fields the scan reads; everything else is never constructed
+_SCAN_FIELDS = frozenset({'name', 'model', 'imports', 'expertise'})
+_MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class _ScanFieldsLoader(_SafeLoader):
+    """Safe loader that only builds Python objects for the scanned fields."""
+
+    def construct_document(self, node):
+        if isinstance(node, yaml.MappingNode):
+            node = yaml.MappingNode(
+                node.tag,
+                [
+                    (key, value) for key, value in node.value
+                    if key.tag == _MERGE_TAG
+                    or (isinstance(key, yaml.ScalarNode) and key.value in _SCAN_FIELDS)
+                ],
+                node.start_mark, node.end_mark, node.flow_style,
+            )
+        return super().construct_document(node)
+
+
+@functools.lru_cache(maxsize=1024)
+def trait_key(category: str, trait: str) -> str:
+    """Return the interned ``category/trait`` key for a trait reference.
+
+    The same pairs recur across every agent, so the key string is built
+    once and interned to make later dict hashing and comparison cheap.
+    """
+    return sys.intern(f"{category}/{trait}")
+
+
+def load_personas(
+    data_dir: Path,
+    errors: List[Tuple[Path, Exception]],
+    loader: type = _SafeLoader,
+) -> Iterator[Tuple[Path, str, Any]]:
+    """Yield ``(source, agent_name, agent_data)`` for every persona.
+
+    Reads each file in ``data_dir/personas``. File handles go straight to
+    the parser; load failures are appended to ``errors``.
+    """
+    personas_dir = data_dir / "personas"
+    if not personas_dir.exists():
+        return
+
+    for agent_file in personas_dir.glob("*.yaml"):
+        try:
+            with open(agent_file, 'rb') as f:
+                agent_data = yaml.load(f, Loader=loader)
+        except Exception as e:
+            errors.append((agent_file, e))
+            continue
+
+        yield agent_file, agent_file.stem, agent_data
+
+
+def _empty_model_distribution() -> Dict[str, List[str]]:
+    return {"haiku": [], "sonnet": [], "opus": []}
+
+
+@dataclass
+class PersonaScan:
+    """Cross-agent data collected from a single pass over the personas."""
+
+    total: int = 0
+    model_distribution: Dict[str, List[str]] = field(
+        default_factory=_empty_model_distribution
+    )
+    trait_usage: Dict[str, List[str]] = field(default_factory=dict)
+    expertise_overlap: Dict[str, List[str]] = field(default_factory=dict)
+    coordination_patterns: Dict[str, List[str]] = field(default_factory=dict)
+    errors: List[Tuple[Path, Exception]] = field(default_factory=list)
+
+
+def scan_personas(data_dir: Path) -> PersonaScan:
+    """Parse each persona under ``data_dir`` once and accumulate usage data."""
+    scan = PersonaScan()
+
+    # Accumulate into locals; they are copied onto the scan at the end
+    model_distribution: Dict[str, List[str]] = scan.model_distribution
+    trait_usage: Dict[str, List[str]] = defaultdict(list)
+    expertise_overlap: Dict[str, List[str]] = defaultdict(list)
+    coordination_patterns: Dict[str, List[str]] = defaultdict(list)
+    total: int = 0
+
+    for source, agent_name, agent_data in load_personas(
+        data_dir, scan.errors, loader=_ScanFieldsLoader
+    ):
+        try:
+            total += 1
+
+            # Model distribution
+            model: str = agent_data.get('model', 'sonnet')
+            if model in model_distribution:
+                model_distribution[model].append(agent_name)
+
+            # Trait usage analysis
+            imports: Dict[str, List[str]] = agent_data.get('imports', {})
+            if 'imports' in agent_data:
+                for category, traits in imports.items():
+                    for trait in traits:
+                        trait_usage[trait_key(category, trait)].append(agent_name)
+
+            # Expertise overlap analysis
+            if 'expertise' in agent_data:
+                for expertise in agent_data['expertise']:
+                    expertise_overlap[expertise.lower()].append(agent_name)
+
+            # Coordination pattern detection
+            if 'coordination' in imports:
+                for trait in imports['coordination']:
+                    coordination_patterns[trait].append(agent_name)
+
+        except Exception as e:
+            scan.errors.append((source, e))
+
+    # Hand back plain dicts so lookups by callers never insert keys
+    scan.total = total
+    scan.trait_usage = dict(trait_usage)
+    scan.expertise_overlap = dict(expertise_overlap)
+    scan.coordination_patterns = dict(coordination_patterns)
+
+    return scan
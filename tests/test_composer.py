@@ -24,7 +24,8 @@ def temp_data_dir():
             "description": "A test agent",
             "expertise": ["Testing"],
             "responsibilities": ["Test things"],
-            "traits": ["safety/test-trait"]
+            "traits": ["safety/test-trait"],
+            "quality_criteria": {"coverage": {"minimum": 80}}
         }
         
         with open(temp_path / "personas" / "test-agent.yaml", 'w') as f:
@@ -88,6 +89,17 @@ def test_load_agent(temp_data_dir):
     assert "safety/test-trait" in agent.traits
 
 
+def test_load_agent_returns_independent_copies(temp_data_dir):
+    """Test mutating a loaded agent does not leak into later loads."""
+    composer = AgentComposer(data_dir=temp_data_dir)
+    agent = composer.load_agent("test-agent")
+    agent.quality_criteria["coverage"]["minimum"] = 0
+
+    reloaded = composer.load_agent("test-agent")
+
+    assert reloaded.quality_criteria["coverage"]["minimum"] == 80
+
+
 def test_load_trait(temp_data_dir):
     """Test loading trait from YAML file."""
     composer = AgentComposer(data_dir=temp_data_dir)
@@ -11,74 +11,56 @@ from pathlib import Path
 from typing import Dict, List, Set, Any, Tuple
 from claude_config.composer import AgentComposer
 from claude_config.validator import ConfigValidator
+from tests.persona_scan import PersonaScan, load_personas, scan_personas, trait_key
 
 
 class CrossAgentIntegrationFramework:
     """Framework for testing cross-agent integration patterns."""
 
+    # Common development workflows and expected agent coordination
+    DEVELOPMENT_WORKFLOWS = {
+        "full_stack_development": frozenset({
+            "frontend-engineer", "python-engineer", "database-engineer",
+            "devops-engineer", "security-engineer", "qa-engineer"
+        }),
+        "ai_ml_pipeline": frozenset({
+            "ai-researcher", "ai-engineer", "data-engineer",
+            "python-engineer", "performance-engineer"
+        }),
+        "mobile_development": frozenset({
+            "mobile-engineer", "python-engineer", "database-engineer",
+            "security-engineer", "qa-engineer"
+        })
+    }
+
     def __init__(self, data_dir: Path = None):
         self.data_dir = data_dir or Path("data")
         self.traits_dir = Path("src/claude_config/traits")
         self.composer = AgentComposer(self.data_dir)
         self.validator = ConfigValidator(self.data_dir)
+        self._persona_scan = None
+
+    def _scan_personas(self) -> PersonaScan:
+        """Scan the personas once per framework and reuse the result."""
+        if self._persona_scan is None:
+            self._persona_scan = scan_personas(self.data_dir)
+        return self._persona_scan
 
     def analyze_coordination_patterns(self) -> Dict[str, Any]:
         """Analyze coordination patterns across agents."""
-        coordination_analysis = {
-            "total_agents": 0,
-            "coordination_patterns": {},
-            "trait_usage": {},
-            "model_distribution": {"haiku": [], "sonnet": [], "opus": []},
-            "expertise_overlap": {},
-            "responsibility_gaps": []
-        }
-
-        personas_dir = self.data_dir / "personas"
-        if not personas_dir.exists():
-            return coordination_analysis
-
-        for agent_file in personas_dir.glob("*.yaml"):
-            try:
-                with open(agent_file, 'r') as f:
-                    agent_data = yaml.safe_load(f)
+        scan = self._scan_personas()
 
-                agent_name = agent_file.stem
-                coordination_analysis["total_agents"] += 1
+        for agent_file, e in scan.errors:
+            print(f"Error analyzing {agent_file}: {e}")
 
-                # Model distribution
-                model = agent_data.get('model', 'sonnet')
-                if model in coordination_analysis["model_distribution"]:
-                    coordination_analysis["model_distribution"][model].append(agent_name)
-
-                # Trait usage analysis
-                if 'imports' in agent_data:
-                    for category, traits in agent_data['imports'].items():
-                        for trait in traits:
-                            trait_key = f"{category}/{trait}"
-                            if trait_key not in coordination_analysis["trait_usage"]:
-                                coordination_analysis["trait_usage"][trait_key] = []
-                            coordination_analysis["trait_usage"][trait_key].append(agent_name)
-
-                # Expertise overlap analysis
-                if 'expertise' in agent_data:
-                    for expertise in agent_data['expertise']:
-                        expertise_lower = expertise.lower()
-                        if expertise_lower not in coordination_analysis["expertise_overlap"]:
-                            coordination_analysis["expertise_overlap"][expertise_lower] = []
-                        coordination_analysis["expertise_overlap"][expertise_lower].append(agent_name)
-
-                # Coordination pattern detection
-                if 'coordination' in agent_data.get('imports', {}):
-                    coord_traits = agent_data['imports']['coordination']
-                    for trait in coord_traits:
-                        if trait not in coordination_analysis["coordination_patterns"]:
-                            coordination_analysis["coordination_patterns"][trait] = []
-                        coordination_analysis["coordination_patterns"][trait].append(agent_name)
-
-            except Exception as e:
-                print(f"Error analyzing {agent_file}: {e}")
-
-        return coordination_analysis
+        return {
+            "total_agents": scan.total,
+            "coordination_patterns": scan.coordination_patterns,
+            "trait_usage": scan.trait_usage,
+            "model_distribution": scan.model_distribution,
+            "expertise_overlap": scan.expertise_overlap,
+            "responsibility_gaps": []
+        }
 
     def validate_tier_consistency(self) -> List[str]:
         """Validate model tier consistency and appropriateness."""
@@ -263,30 +245,14 @@ class CrossAgentIntegrationFramework:
         """Validate common development workflow patterns."""
         errors = []
 
-        # Common development workflows and expected agent coordination
-        workflows = {
-            "full_stack_development": [
-                "frontend-engineer", "python-engineer", "database-engineer",
-                "devops-engineer", "security-engineer", "qa-engineer"
-            ],
-            "ai_ml_pipeline": [
-                "ai-researcher", "ai-engineer", "data-engineer",
-                "python-engineer", "performance-engineer"
-            ],
-            "mobile_development": [
-                "mobile-engineer", "python-engineer", "database-engineer",
-                "security-engineer", "qa-engineer"
-            ]
-        }
-
         personas_dir = self.data_dir / "personas"
         if not personas_dir.exists():
             return ["No personas directory found"]
 
-        existing_agents = set(f.stem for f in personas_dir.glob("*.yaml"))
+        existing_agents = {f.stem for f in personas_dir.glob("*.yaml")}
 
-        for workflow, required_agents in workflows.items():
-            missing_agents = set(required_agents) - existing_agents
+        for workflow, required_agents in self.DEVELOPMENT_WORKFLOWS.items():
+            missing_agents = required_agents - existing_agents
             if missing_agents:
                 errors.append(
                     f"Workflow {workflow} missing agents: {', '.join(missing_agents)}"
@@ -347,35 +313,34 @@ class TraitIntegrationValidator:
 
         # Get all trait references from agents
         trait_references = set()
-        personas_dir = self.data_dir / "personas"
-
-        if personas_dir.exists():
-            for agent_file in personas_dir.glob("*.yaml"):
-                try:
-                    with open(agent_file, 'r') as f:
-                        agent_data = yaml.safe_load(f)
+        load_errors = []
 
-                    if 'imports' in agent_data:
-                        for category, traits in agent_data['imports'].items():
-                            for trait in traits:
-                                trait_references.add(f"{category}/{trait}")
+        for agent_file, _, agent_data in load_personas(self.data_dir, load_errors):
+            try:
+                if 'imports' in agent_data:
+                    for category, traits in agent_data['imports'].items():
+                        for trait in traits:
+                            trait_references.add(trait_key(category, trait))
 
-                except Exception as e:
-                    errors.append(f"Error reading {agent_file}: {e}")
+            except Exception as e:
+                load_errors.append((agent_file, e))
 
-        # Check if referenced trait files exist
-        for trait_ref in trait_references:
-            trait_file = self.traits_dir / f"{trait_ref}.md"
-            if not trait_file.exists():
-                errors.append(f"Referenced trait file missing: {trait_file}")
+        for agent_file, e in load_errors:
+            errors.append(f"Error reading {agent_file}: {e}")
 
-        # Check for orphaned trait files (not referenced by any agent)
+        # Scan the traits tree once; existence and orphan checks both use it
         available_traits = set()
         for category_dir in self.traits_dir.iterdir():
             if category_dir.is_dir():
                 for trait_file in category_dir.glob("*.md"):
-                    available_traits.add(f"{category_dir.name}/{trait_file.stem}")
+                    available_traits.add(trait_key(category_dir.name, trait_file.stem))
 
+        # Check if referenced trait files exist
+        for trait_ref in trait_references - available_traits:
+            trait_file = self.traits_dir / f"{trait_ref}.md"
+            errors.append(f"Referenced trait file missing: {trait_file}")
+
+        # Check for orphaned trait files (not referenced by any agent)
         orphaned_traits = available_traits - trait_references
         if orphaned_traits:
             # This is a warning, not an error
